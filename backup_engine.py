@@ -0,0 +1,502 @@
+"""
+Incremental, deduplicating backup engine for the Tawq project.
+
+Files are split with content-defined chunking (a gear rolling hash), every
+unique chunk is stored once under ``backups/store/chunks`` and every backup
+is a small JSON manifest under ``backups/store/snapshots`` that lists the
+chunks of each file.  A new snapshot only reads files whose size or mtime
+changed since the previous one, so backup time and disk usage grow with the
+amount of change rather than with the size of the project.
+
+Usage (from the repository root):
+
+    python backup_engine.py backup [--label TEXT]
+    python backup_engine.py list
+    python backup_engine.py restore SNAPSHOT_ID [--target DIR]
+    python backup_engine.py verify [SNAPSHOT_ID] [--deep]
+    python backup_engine.py prune --keep N
+    python backup_engine.py import-zip backups/backup_*.zip
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+import zipfile
+import zlib
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_REL = "workspace/shadcn-ui"
+DEFAULT_STORE = os.path.join(ROOT_DIR, "backups", "store")
+
+# Same selection as the old backup.bat (xcopy of src/public/docs + configs)
+PROJECT_DIRS = ["src", "public", "docs"]
+PROJECT_FILES = [
+    "package.json",
+    "tsconfig.json",
+    "vite.config.ts",
+    "tailwind.config.ts",
+    "postcss.config.js",
+    "components.json",
+    "index.html",
+    "README.md",
+]
+ROOT_PATTERNS = ["*.bat", "*.ps1"]
+# Kept in snapshots for reference but never written back: restore.bat is the
+# script running the restore (cmd.exe re-reads it mid-run), and restoring an
+# old snapshot must not downgrade the backup tooling itself.
+RESTORE_EXCLUDE = {"backup.bat", "restore.bat", "auto-backup.bat"}
+SKIP_DIRS = {"node_modules", ".git", "dist", "build", ".cache", "temp", "__pycache__"}
+
+# Content-defined chunking parameters (bytes)
+MIN_CHUNK = 2 * 1024
+AVG_CHUNK = 8 * 1024
+MAX_CHUNK = 64 * 1024
+_MASK = AVG_CHUNK - 1
+
+# Deterministic gear table: chunk boundaries must be stable between runs
+_rng = random.Random(0x7A77)
+GEAR = [_rng.getrandbits(32) for _ in range(256)]
+
+
+# snap_YYYYMMDD_HHMMSS with an optional _N suffix for same-second snapshots
+_SNAPSHOT_ID_RE = re.compile(r"^snap_(\d{8})_(\d{6})(?:_(\d+))?$")
+
+
+class BackupError(Exception):
+    """Raised for missing snapshots, corrupt chunks and similar failures."""
+
+
+# ====================================
+# Chunking
+# ====================================
+
+def iter_chunks(data):
+    """Yield content-defined chunks of ``data`` (bytes)."""
+    length = len(data)
+    start = 0
+    while start < length:
+        end = min(start + MAX_CHUNK, length)
+        if end - start <= MIN_CHUNK:
+            yield data[start:end]
+            return
+        h = 0
+        cut = end
+        i = start + MIN_CHUNK
+        while i < end:
+            h = ((h << 1) + GEAR[data[i]]) & 0xFFFFFFFF
+            if not h & _MASK:
+                cut = i + 1
+                break
+            i += 1
+        yield data[start:cut]
+        start = cut
+
+
+# ====================================
+# Chunk store
+# ====================================
+
+class ChunkStore:
+    """Content-addressed, zlib-compressed chunk storage with snapshot manifests."""
+
+    def __init__(self, path):
+        self.path = path
+        self.chunks_dir = os.path.join(path, "chunks")
+        self.snapshots_dir = os.path.join(path, "snapshots")
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def has_chunk(self, digest):
+        return os.path.exists(self._chunk_path(digest))
+
+    def put_chunk(self, data):
+        """Store a chunk if it is new; return ``(digest, stored_bytes)``."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        packed = zlib.compress(data, 6)
+        _atomic_write(path, packed)
+        return digest, len(packed)
+
+    def get_chunk(self, digest):
+        try:
+            with open(self._chunk_path(digest), "rb") as f:
+                data = zlib.decompress(f.read())
+        except FileNotFoundError:
+            raise BackupError(f"missing chunk {digest}")
+        except zlib.error:
+            raise BackupError(f"corrupt chunk {digest}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BackupError(f"chunk {digest} failed its integrity check")
+        return data
+
+    def all_chunks(self):
+        for sub in os.listdir(self.chunks_dir):
+            sub_dir = os.path.join(self.chunks_dir, sub)
+            if os.path.isdir(sub_dir):
+                for name in os.listdir(sub_dir):
+                    if not name.endswith(".tmp"):
+                        yield name
+
+    def delete_chunk(self, digest):
+        path = self._chunk_path(digest)
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+
+    # --- snapshots ---
+
+    def snapshot_ids(self):
+        """Snapshot ids, oldest first (by snapshot time, not by name)."""
+        ids = [n[:-5] for n in os.listdir(self.snapshots_dir) if n.endswith(".json")]
+        return sorted(ids, key=self._sort_key)
+
+    def _sort_key(self, snapshot_id):
+        match = _SNAPSHOT_ID_RE.match(snapshot_id)
+        if match:
+            try:
+                stamp = time.mktime(time.strptime(match.group(1) + match.group(2), "%Y%m%d%H%M%S"))
+                return (stamp, int(match.group(3) or 1), snapshot_id)
+            except ValueError:
+                pass
+        # Ids that do not carry a usable time (e.g. odd legacy zip names)
+        try:
+            created = self.load_snapshot(snapshot_id).get("created", "")
+            stamp = time.mktime(time.strptime(created, "%Y-%m-%dT%H:%M:%S"))
+        except (BackupError, ValueError, json.JSONDecodeError):
+            stamp = 0.0
+        return (stamp, 0, snapshot_id)
+
+    def load_snapshot(self, snapshot_id):
+        path = os.path.join(self.snapshots_dir, snapshot_id + ".json")
+        if not os.path.exists(path):
+            raise BackupError(f"snapshot not found: {snapshot_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_snapshot(self, manifest):
+        path = os.path.join(self.snapshots_dir, manifest["id"] + ".json")
+        data = json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8")
+        _atomic_write(path, data)
+
+    def delete_snapshot(self, snapshot_id):
+        os.remove(os.path.join(self.snapshots_dir, snapshot_id + ".json"))
+
+    def latest_snapshot(self):
+        ids = self.snapshot_ids()
+        return self.load_snapshot(ids[-1]) if ids else None
+
+
+def _atomic_write(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ====================================
+# Backup / restore
+# ====================================
+
+def collect_files(root):
+    """Return repo-relative paths (forward slashes) selected for backup."""
+    project = os.path.join(root, PROJECT_REL)
+    selected = []
+    for name in PROJECT_DIRS:
+        base = os.path.join(project, name)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for filename in sorted(filenames):
+                selected.append(os.path.join(dirpath, filename))
+    for name in PROJECT_FILES:
+        path = os.path.join(project, name)
+        if os.path.isfile(path):
+            selected.append(path)
+    for pattern in ROOT_PATTERNS:
+        selected.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return [os.path.relpath(p, root).replace(os.sep, "/") for p in selected]
+
+
+def _store_bytes(store, data, stats):
+    chunks = []
+    for chunk in iter_chunks(data):
+        digest, written = store.put_chunk(chunk)
+        chunks.append(digest)
+        if written:
+            stats["new_chunks"] += 1
+            stats["bytes_written"] += written
+    return chunks
+
+
+def create_snapshot(store, root, label=""):
+    """Create an incremental snapshot of ``root`` and return its manifest."""
+    parent = store.latest_snapshot()
+    previous = parent["files"] if parent else {}
+    started = time.time()
+    stats = {"files": 0, "changed": 0, "new_chunks": 0, "bytes_written": 0, "bytes_total": 0}
+    files = {}
+
+    for rel in collect_files(root):
+        path = os.path.join(root, rel)
+        st = os.stat(path)
+        stats["files"] += 1
+        stats["bytes_total"] += st.st_size
+        old = previous.get(rel)
+        # Fast path: unchanged size + mtime -> reuse the previous chunk list
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns \
+                and all(store.has_chunk(c) for c in old["chunks"]):
+            files[rel] = old
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        sha = hashlib.sha256(data).hexdigest()
+        if old and old["sha256"] == sha:
+            files[rel] = dict(old, mtime_ns=st.st_mtime_ns)
+            continue
+        stats["changed"] += 1
+        files[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "mode": st.st_mode & 0o777,
+            "sha256": sha,
+            "chunks": _store_bytes(store, data, stats),
+        }
+
+    removed = sorted(set(previous) - set(files))
+    stats["removed"] = len(removed)
+    stats["seconds"] = round(time.time() - started, 3)
+    manifest = {
+        "id": _new_snapshot_id(store),
+        "parent": parent["id"] if parent else None,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "label": label,
+        "source": PROJECT_REL,
+        "files": files,
+        "removed": removed,
+        "stats": stats,
+    }
+    store.save_snapshot(manifest)
+    return manifest
+
+
+def _new_snapshot_id(store):
+    base = "snap_" + time.strftime("%Y%m%d_%H%M%S")
+    existing = set(store.snapshot_ids())
+    snapshot_id, n = base, 1
+    while snapshot_id in existing:
+        n += 1
+        snapshot_id = f"{base}_{n}"
+    return snapshot_id
+
+
+def restore_snapshot(store, snapshot_id, target):
+    """Write the files of a snapshot under ``target``; return the file count.
+
+    The backup/restore scripts (``RESTORE_EXCLUDE``) are left untouched.
+    """
+    manifest = store.load_snapshot(snapshot_id)
+    cache = {}
+    restored = 0
+    for rel, entry in manifest["files"].items():
+        if rel in RESTORE_EXCLUDE:
+            continue
+        out = os.path.join(target, *rel.split("/"))
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        digest = hashlib.sha256()
+        tmp = out + ".restore.tmp"
+        with open(tmp, "wb") as f:
+            for chunk_id in entry["chunks"]:
+                data = cache.get(chunk_id)
+                if data is None:
+                    data = store.get_chunk(chunk_id)
+                    if len(data) < MIN_CHUNK:
+                        cache[chunk_id] = data
+                digest.update(data)
+                f.write(data)
+        if digest.hexdigest() != entry["sha256"]:
+            os.remove(tmp)
+            raise BackupError(f"{rel}: restored content does not match manifest")
+        os.replace(tmp, out)
+        if entry.get("mode"):
+            os.chmod(out, entry["mode"])
+        restored += 1
+    return restored
+
+
+def verify_snapshots(store, snapshot_ids, deep=False):
+    """Check that every referenced chunk exists (and, with ``deep``, re-hash it).
+
+    Returns a list of problem descriptions; empty means the snapshots are intact.
+    """
+    problems = []
+    checked = set()
+    for snapshot_id in snapshot_ids:
+        manifest = store.load_snapshot(snapshot_id)
+        for rel, entry in manifest["files"].items():
+            for chunk_id in entry["chunks"]:
+                if chunk_id in checked:
+                    continue
+                checked.add(chunk_id)
+                try:
+                    if deep:
+                        store.get_chunk(chunk_id)
+                    elif not store.has_chunk(chunk_id):
+                        raise BackupError(f"missing chunk {chunk_id}")
+                except BackupError as exc:
+                    problems.append(f"{snapshot_id}: {rel}: {exc}")
+    return problems
+
+
+def prune_snapshots(store, keep):
+    """Keep the newest ``keep`` snapshots and drop chunks nobody references."""
+    ids = store.snapshot_ids()
+    for snapshot_id in ids[:-keep] if keep > 0 else ids:
+        store.delete_snapshot(snapshot_id)
+    live = set()
+    for snapshot_id in store.snapshot_ids():
+        for entry in store.load_snapshot(snapshot_id)["files"].values():
+            live.update(entry["chunks"])
+    freed = 0
+    for digest in list(store.all_chunks()):
+        if digest not in live:
+            freed += store.delete_chunk(digest)
+    return freed
+
+
+def import_zip(store, zip_path):
+    """Ingest a legacy ``backup_*.zip`` produced by the old backup.bat."""
+    parent = store.latest_snapshot()
+    stats = {"files": 0, "changed": 0, "new_chunks": 0, "bytes_written": 0, "bytes_total": 0}
+    files = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            name = info.filename.replace("\\", "/")
+            parts = name.split("/", 1)
+            if info.is_dir() or len(parts) < 2 or not parts[1]:
+                continue
+            inner = parts[1]
+            if inner == "backup-info.json":
+                continue
+            if "/" not in inner and os.path.splitext(inner)[1].lower() in (".bat", ".ps1"):
+                rel = inner
+            else:
+                rel = f"{PROJECT_REL}/{inner}"
+            data = zf.read(info)
+            stats["files"] += 1
+            stats["changed"] += 1
+            stats["bytes_total"] += len(data)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            files[rel] = {
+                "size": len(data),
+                "mtime_ns": int(mtime * 1e9),
+                "mode": 0o644,
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "chunks": _store_bytes(store, data, stats),
+            }
+    stem = os.path.splitext(os.path.basename(zip_path))[0]
+    manifest = {
+        "id": "snap_" + stem.replace("backup_", "", 1),
+        "parent": parent["id"] if parent else None,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "label": f"imported from {os.path.basename(zip_path)}",
+        "source": PROJECT_REL,
+        "files": files,
+        "removed": [],
+        "stats": stats,
+    }
+    store.save_snapshot(manifest)
+    return manifest
+
+
+# ====================================
+# CLI
+# ====================================
+
+def _fmt_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _print_manifest(manifest):
+    s = manifest["stats"]
+    print(f"Snapshot: {manifest['id']}")
+    print(f"  Files: {s['files']} ({s['changed']} changed, {s.get('removed', 0)} removed)")
+    print(f"  New chunks: {s['new_chunks']} ({_fmt_size(s['bytes_written'])} written, "
+          f"{_fmt_size(s['bytes_total'])} in snapshot)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tawq incremental backup engine")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="chunk store directory")
+    parser.add_argument("--root", default=ROOT_DIR, help="repository root to back up")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backup", help="create a new incremental snapshot")
+    p.add_argument("--label", default="")
+    sub.add_parser("list", help="list snapshots")
+    p = sub.add_parser("restore", help="restore a snapshot")
+    p.add_argument("snapshot")
+    p.add_argument("--target", default=None, help="defaults to --root")
+    p = sub.add_parser("verify", help="verify snapshot integrity")
+    p.add_argument("snapshot", nargs="?")
+    p.add_argument("--deep", action="store_true", help="decompress and re-hash every chunk")
+    p = sub.add_parser("prune", help="drop old snapshots and unreferenced chunks")
+    p.add_argument("--keep", type=int, required=True)
+    p = sub.add_parser("import-zip", help="import legacy backup_*.zip archives")
+    p.add_argument("zips", nargs="+")
+
+    args = parser.parse_args(argv)
+    store = ChunkStore(args.store)
+
+    try:
+        if args.command == "backup":
+            _print_manifest(create_snapshot(store, args.root, args.label))
+        elif args.command == "list":
+            ids = store.snapshot_ids()
+            if not ids:
+                print("No snapshots available!")
+            for snapshot_id in ids:
+                m = store.load_snapshot(snapshot_id)
+                label = f"  {m['label']}" if m.get("label") else ""
+                print(f"{snapshot_id}  {m['created']}  {len(m['files'])} files  "
+                      f"+{_fmt_size(m['stats']['bytes_written'])}{label}")
+        elif args.command == "restore":
+            count = restore_snapshot(store, args.snapshot, args.target or args.root)
+            print(f"Restored {count} files from {args.snapshot}")
+        elif args.command == "verify":
+            ids = [args.snapshot] if args.snapshot else store.snapshot_ids()
+            problems = verify_snapshots(store, ids, deep=args.deep)
+            for problem in problems:
+                print(problem)
+            print(f"Verified {len(ids)} snapshot(s): "
+                  f"{'OK' if not problems else str(len(problems)) + ' problem(s)'}")
+            return 1 if problems else 0
+        elif args.command == "prune":
+            freed = prune_snapshots(store, args.keep)
+            print(f"Freed {_fmt_size(freed)}")
+        elif args.command == "import-zip":
+            # cmd.exe does not expand wildcards, so expand them here
+            paths = sorted(p for pattern in args.zips for p in glob.glob(pattern) or [pattern])
+            for zip_path in paths:
+                _print_manifest(import_zip(store, zip_path))
+    except BackupError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
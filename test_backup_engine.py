@@ -0,0 +1,94 @@
+"""Snapshot and restore round-trips for backup_engine.py (run with pytest)."""
+
+import os
+
+import backup_engine as engine
+
+
+def _write(root, rel, data):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read(root, rel):
+    with open(os.path.join(root, *rel.split("/")), "rb") as f:
+        return f.read()
+
+
+def _project(tmp_path):
+    root = str(tmp_path / "repo")
+    big = bytes(range(256)) * 1024
+    _write(root, "workspace/shadcn-ui/src/app.ts", b"export const version = 1;\n")
+    _write(root, "workspace/shadcn-ui/src/assets/data.bin", big)
+    _write(root, "workspace/shadcn-ui/package.json", b'{"name": "tawq"}\n')
+    _write(root, "workspace/shadcn-ui/node_modules/x/index.js", b"ignored")
+    _write(root, "RUN-APP.bat", b"@echo run v1\r\n")
+    _write(root, "restore.bat", b"@echo restore v1\r\n")
+    return root, big
+
+
+def test_snapshot_restore_round_trip(tmp_path):
+    root, big = _project(tmp_path)
+    store = engine.ChunkStore(str(tmp_path / "store"))
+
+    first = engine.create_snapshot(store, root, "first")
+    assert "workspace/shadcn-ui/node_modules/x/index.js" not in first["files"]
+    assert first["stats"]["changed"] == len(first["files"]) == 5
+
+    _write(root, "workspace/shadcn-ui/src/app.ts", b"export const version = 2;\n")
+    os.remove(os.path.join(root, "workspace", "shadcn-ui", "package.json"))
+    second = engine.create_snapshot(store, root)
+    assert second["parent"] == first["id"]
+    assert second["stats"]["changed"] == 1
+    assert second["removed"] == ["workspace/shadcn-ui/package.json"]
+    assert not engine.verify_snapshots(store, store.snapshot_ids(), deep=True)
+
+    target = str(tmp_path / "restored")
+    assert engine.restore_snapshot(store, first["id"], target) == 4
+    assert _read(target, "workspace/shadcn-ui/src/app.ts") == b"export const version = 1;\n"
+    assert _read(target, "workspace/shadcn-ui/src/assets/data.bin") == big
+    assert _read(target, "workspace/shadcn-ui/package.json") == b'{"name": "tawq"}\n'
+    assert _read(target, "RUN-APP.bat") == b"@echo run v1\r\n"
+
+
+def test_restore_keeps_live_backup_scripts(tmp_path):
+    root, _ = _project(tmp_path)
+    store = engine.ChunkStore(str(tmp_path / "store"))
+    snapshot = engine.create_snapshot(store, root)
+
+    _write(root, "restore.bat", b"@echo restore v2\r\n")
+    _write(root, "RUN-APP.bat", b"@echo run v2\r\n")
+    engine.restore_snapshot(store, snapshot["id"], root)
+
+    assert _read(root, "restore.bat") == b"@echo restore v2\r\n"
+    assert _read(root, "RUN-APP.bat") == b"@echo run v1\r\n"
+
+
+def test_unchanged_tree_writes_no_chunks(tmp_path):
+    root, _ = _project(tmp_path)
+    store = engine.ChunkStore(str(tmp_path / "store"))
+    engine.create_snapshot(store, root)
+
+    again = engine.create_snapshot(store, root)
+    assert again["stats"]["changed"] == 0
+    assert again["stats"]["new_chunks"] == 0
+
+
+def test_snapshot_ids_sort_by_time(tmp_path):
+    store = engine.ChunkStore(str(tmp_path / "store"))
+    ids = ["snap_20251204_000125", "snap_20251203_234830_10", "snap_20251203_234830_2",
+           "snap_20251203_234830", "snap_custom"]
+    for snapshot_id in ids:
+        created = "2025-12-03T12:00:00" if snapshot_id == "snap_custom" else "2026-01-01T00:00:00"
+        store.save_snapshot({"id": snapshot_id, "created": created, "files": {}})
+
+    assert store.snapshot_ids() == [
+        "snap_custom",
+        "snap_20251203_234830",
+        "snap_20251203_234830_2",
+        "snap_20251203_234830_10",
+        "snap_20251204_000125",
+    ]
+    assert store.latest_snapshot()["id"] == "snap_20251204_000125"